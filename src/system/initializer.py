@@ -7,22 +7,61 @@ Gestisce l'inizializzazione coordinata dei vari sottosistemi
 import os
 import sys
 import importlib
+import traceback
 from typing import Dict, List, Any, Optional, Callable
 from pathlib import Path
 
-# Se possibile importa il logger, altrimenti usa funzioni di fallback
-try:
-    from src.system.logger import get_logger
-    logger = get_logger()
-except ImportError:
-    # Logger di fallback
-    class SimpleLogger:
-        def debug(self, msg): print(f"DEBUG: {msg}")
-        def info(self, msg): print(f"INFO: {msg}")
-        def warning(self, msg): print(f"WARNING: {msg}")
-        def error(self, msg): print(f"ERROR: {msg}")
-        def critical(self, msg): print(f"CRITICAL: {msg}")
-    logger = SimpleLogger()
+# Logger di fallback: scrive direttamente i byte su stderr, senza
+# passare per print() e il livello di codifica testuale
+class SimpleLogger:
+    def _emit(self, prefix: bytes, msg) -> None:
+        # stderr viene risolto a ogni messaggio: può essere stato
+        # reindirizzato, non avere un buffer binario o mancare del tutto
+        stream = sys.stderr
+        if stream is None:
+            return
+        
+        data = prefix + str(msg).encode("utf-8", "replace") + b"\n"
+        buf = getattr(stream, "buffer", None)
+        if buf is not None:
+            buf.write(data)
+        else:
+            stream.write(data.decode("utf-8", "replace"))
+
+    def debug(self, msg): self._emit(b"DEBUG: ", msg)
+    def info(self, msg): self._emit(b"INFO: ", msg)
+    def warning(self, msg): self._emit(b"WARNING: ", msg)
+    def error(self, msg): self._emit(b"ERROR: ", msg)
+    def critical(self, msg): self._emit(b"CRITICAL: ", msg)
+
+# Il logger viene risolto al primo utilizzo: l'import del modulo non
+# deve caricare `logging` né creare file di log
+logger = None
+
+def _log():
+    """
+    Restituisce il logger di sistema, creandolo al primo utilizzo.
+    Se il modulo di logging non è disponibile usa SimpleLogger.
+    """
+    global logger
+
+    if logger is None:
+        try:
+            from src.system.logger import get_logger
+            logger = get_logger()
+        except ImportError:
+            logger = SimpleLogger()
+
+    return logger
+
+def _debug_if_loaded(msg) -> None:
+    """
+    Registra un messaggio di debug solo se il logger è già stato creato:
+    la registrazione dei componenti non deve caricare `logging`, che
+    viene risolto al primo initialize().
+    """
+    if logger is not None:
+        logger.debug(msg)
 
 class SystemInitializer:
     """
@@ -31,13 +70,20 @@ class SystemInitializer:
     personalizzare il comportamento durante l'avvio.
     """
     def __init__(self):
-        self.base_path = Path(__file__).parent.parent.parent.absolute()
+        self._base_path = None
         self.components = {}
         self.initialized = set()
         self.dependencies = {}
         self.initialization_hooks = {}
         self.system_info = {}
         self.user_info = {}
+    
+    @property
+    def base_path(self) -> Path:
+        """Directory base di ONEX, calcolata al primo accesso."""
+        if self._base_path is None:
+            self._base_path = Path(__file__).resolve().parents[2]
+        return self._base_path
         
     def register_component(self, name: str, 
                          initializer_func: Callable, 
@@ -55,7 +101,7 @@ class SystemInitializer:
             
         self.components[name] = initializer_func
         self.dependencies[name] = dependencies
-        logger.debug(f"Componente registrato: {name}")
+        _debug_if_loaded(f"Componente registrato: {name}")
     
     def register_hook(self, point: str, hook_func: Callable) -> None:
         """
@@ -70,7 +116,7 @@ class SystemInitializer:
             self.initialization_hooks[point] = []
             
         self.initialization_hooks[point].append(hook_func)
-        logger.debug(f"Hook registrato per {point}")
+        _debug_if_loaded(f"Hook registrato per {point}")
     
     def initialize(self, system_info: Dict = None, user_info: Dict = None) -> bool:
         """
@@ -86,7 +132,11 @@ class SystemInitializer:
         self.system_info = system_info or {}
         self.user_info = user_info or {}
         
-        logger.info("Avvio dell'inizializzazione del sistema")
+        log = _log()
+        log_info = log.info
+        log_error = log.error
+        
+        log_info("Avvio dell'inizializzazione del sistema")
         
         # Esegui i pre-hook
         self._execute_hooks('pre_init')
@@ -95,7 +145,7 @@ class SystemInitializer:
         init_order = self._sort_dependencies()
         
         if init_order is None:
-            logger.error("Dipendenze circolari rilevate, impossibile inizializzare")
+            log_error("Dipendenze circolari rilevate, impossibile inizializzare")
             return False
         
         # Inizializza i componenti nell'ordine corretto
@@ -104,13 +154,13 @@ class SystemInitializer:
                 continue
                 
             if not self._initialize_component(component_name):
-                logger.error(f"Inizializzazione fallita per il componente {component_name}")
+                log_error(f"Inizializzazione fallita per il componente {component_name}")
                 return False
         
         # Esegui i post-hook
         self._execute_hooks('post_init')
         
-        logger.info("Inizializzazione del sistema completata con successo")
+        log_info("Inizializzazione del sistema completata con successo")
         return True
     
     def _initialize_component(self, name: str) -> bool:
@@ -125,14 +175,18 @@ class SystemInitializer:
         """
         if name in self.initialized:
             return True
-            
-        logger.debug(f"Inizializzazione del componente: {name}")
+        
+        log = _log()
+        log_debug = log.debug
+        log_error = log.error
+        
+        log_debug(f"Inizializzazione del componente: {name}")
         
         try:
             # Controlla che tutte le dipendenze siano già inizializzate
             for dep in self.dependencies.get(name, []):
                 if dep not in self.initialized:
-                    logger.error(f"Dipendenza {dep} non inizializzata per {name}")
+                    log_error(f"Dipendenza {dep} non inizializzata per {name}")
                     return False
             
             # Inizializza il componente passando le informazioni di sistema
@@ -144,15 +198,15 @@ class SystemInitializer:
             
             if result:
                 self.initialized.add(name)
-                logger.debug(f"Componente {name} inizializzato con successo")
+                log_debug(f"Componente {name} inizializzato con successo")
                 return True
             else:
-                logger.error(f"Inizializzazione fallita per {name}")
+                log_error(f"Inizializzazione fallita per {name}")
                 return False
                 
         except Exception as e:
-            logger.error(f"Errore durante l'inizializzazione di {name}: {str(e)}")
-            logger.debug(f"Dettaglio errore:", exc_info=True)
+            log_error(f"Errore durante l'inizializzazione di {name}: {str(e)}")
+            log_debug(f"Dettaglio errore: {traceback.format_exc()}")
             return False
     
     def _sort_dependencies(self) -> Optional[List[str]]:
@@ -164,40 +218,45 @@ class SystemInitializer:
         """
         result = []
         visited = set()
-        temp_visited = set()
+        components = self.components
+        dependencies = self.dependencies
         
-        def visit(node):
-            if node in temp_visited:
-                # Dipendenza circolare
-                return False
-                
-            if node in visited:
-                return True
-                
-            temp_visited.add(node)
+        # Visita in profondità iterativa con uno stack esplicito di
+        # (nodo, iteratore sulle dipendenze): catene di dipendenze lunghe
+        # non sono limitate dalla profondità di ricorsione di Python
+        for start in components:
+            if start in visited:
+                continue
             
-            # Visita le dipendenze
-            for dep in self.dependencies.get(node, []):
-                if dep not in self.components:
-                    logger.warning(f"Dipendenza {dep} non trovata per {node}")
-                    continue
-                    
-                if not visit(dep):
-                    return False
+            stack = [(start, iter(dependencies.get(start, [])))]
+            temp_visited = {start}
             
-            temp_visited.remove(node)
-            visited.add(node)
-            result.append(node)
-            return True
-        
-        # Visita tutti i nodi
-        for node in self.components:
-            if node not in visited:
-                if not visit(node):
-                    return None
+            while stack:
+                node, deps = stack[-1]
+                
+                for dep in deps:
+                    if dep not in components:
+                        _log().warning(f"Dipendenza {dep} non trovata per {node}")
+                        continue
+                    
+                    if dep in temp_visited:
+                        # Dipendenza circolare
+                        return None
+                    
+                    if dep not in visited:
+                        temp_visited.add(dep)
+                        stack.append((dep, iter(dependencies.get(dep, []))))
+                        break
+                else:
+                    # Tutte le dipendenze del nodo sono state visitate
+                    stack.pop()
+                    temp_visited.remove(node)
+                    visited.add(node)
+                    result.append(node)
         
-        # Inverti l'ordine (l'algoritmo produce l'ordine inverso)
-        return list(reversed(result))
+        # L'ordine di completamento della visita elenca già ogni
+        # componente dopo le sue dipendenze
+        return result
     
     def _execute_hooks(self, point: str) -> None:
         """
@@ -206,11 +265,19 @@ class SystemInitializer:
         Args:
             point: Punto di hook
         """
-        for hook in self.initialization_hooks.get(point, []):
+        hooks = self.initialization_hooks.get(point)
+        if not hooks:
+            return
+        
+        system_info = self.system_info
+        user_info = self.user_info
+        log_warning = _log().warning
+        
+        for hook in hooks:
             try:
-                hook(system_info=self.system_info, user_info=self.user_info)
+                hook(system_info=system_info, user_info=user_info)
             except Exception as e:
-                logger.warning(f"Errore nell'esecuzione dell'hook {point}: {str(e)}")
+                log_warning(f"Errore nell'esecuzione dell'hook {point}: {str(e)}")
     
     def get_component_status(self) -> Dict[str, bool]:
         """
@@ -235,6 +302,9 @@ def get_initializer() -> SystemInitializer:
     
     if _SYSTEM_INITIALIZER is None:
         _SYSTEM_INITIALIZER = SystemInitializer()
+        # Registra i componenti predefiniti alla prima richiesta,
+        # così l'import del modulo resta privo di effetti collaterali
+        register_default_components()
         
     return _SYSTEM_INITIALIZER
 
@@ -246,11 +316,11 @@ def initialize_filesystem(system_info: Dict, user_info: Dict) -> bool:
         
         # Verifica se il filesystem esiste già
         if fs_root.exists():
-            logger.debug(f"Filesystem già esistente in {fs_root}")
+            _log().debug(f"Filesystem già esistente in {fs_root}")
             return True
             
         # Crea la struttura base
-        logger.info(f"Inizializzazione del filesystem virtuale in {fs_root}")
+        _log().info(f"Inizializzazione del filesystem virtuale in {fs_root}")
         
         # Crea le directory di base
         dirs = ["bin", "etc", "home", "usr", "var", "tmp", "opt", "mnt", "dev", "proc", "sys"]
@@ -270,11 +340,11 @@ def initialize_filesystem(system_info: Dict, user_info: Dict) -> bool:
             for subdir in ['Documents', 'Downloads', 'Pictures']:
                 (user_home / subdir).mkdir(exist_ok=True)
                 
-        logger.info("Filesystem virtuale inizializzato con successo")
+        _log().info("Filesystem virtuale inizializzato con successo")
         return True
         
     except Exception as e:
-        logger.error(f"Errore nell'inizializzazione del filesystem: {str(e)}")
+        _log().error(f"Errore nell'inizializzazione del filesystem: {str(e)}")
         return False
 
 def initialize_graphics(system_info: Dict, user_info: Dict) -> bool:
@@ -285,15 +355,15 @@ def initialize_graphics(system_info: Dict, user_info: Dict) -> bool:
         
         # Verifica che il terminale supporti i colori
         if 'TERM' in os.environ and 'color' in os.environ['TERM']:
-            logger.info("Terminale con supporto colori rilevato")
+            _log().info("Terminale con supporto colori rilevato")
         else:
-            logger.warning("Terminale potrebbe non supportare i colori")
+            _log().warning("Terminale potrebbe non supportare i colori")
             
-        logger.info("Sistema grafico inizializzato con successo")
+        _log().info("Sistema grafico inizializzato con successo")
         return True
         
     except ImportError as e:
-        logger.error(f"Errore nell'importazione dei moduli grafici: {str(e)}")
+        _log().error(f"Errore nell'importazione dei moduli grafici: {str(e)}")
         return False
 
 def initialize_shell(system_info: Dict, user_info: Dict) -> bool:
@@ -305,12 +375,12 @@ def initialize_shell(system_info: Dict, user_info: Dict) -> bool:
         if not shell_type:
             shell_type = 'unknown'
             
-        logger.info(f"Shell rilevata: {shell_type}")
-        logger.info("Sistema shell inizializzato con successo")
+        _log().info(f"Shell rilevata: {shell_type}")
+        _log().info("Sistema shell inizializzato con successo")
         return True
         
     except ImportError as e:
-        logger.error(f"Errore nell'inizializzazione della shell: {str(e)}")
+        _log().error(f"Errore nell'inizializzazione della shell: {str(e)}")
         return False
 
 # Registrazione dei componenti di sistema
@@ -322,6 +392,3 @@ def register_default_components():
     initializer.register_component('filesystem', initialize_filesystem, [])
     initializer.register_component('shell', initialize_shell, [])
     initializer.register_component('graphics', initialize_graphics, ['shell'])
-
-# Pre-registra i componenti predefiniti
-register_default_components()
@@ -12,6 +12,29 @@ from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+class _LazyFileHandler(logging.FileHandler):
+    """
+    FileHandler che crea la directory dei log, sceglie il nome del file
+    (con timestamp) e lo apre solo quando viene emesso il primo record.
+    """
+    def __init__(self, log_dir: Path, app_name: str):
+        self._log_dir = log_dir
+        self._app_name = app_name
+        super().__init__(log_dir / f"{app_name}.log", delay=True)
+    
+    def _open(self):
+        # Crea la directory dei log se non esiste
+        try:
+            self._log_dir.mkdir(parents=True, exist_ok=True)
+        except Exception as e:
+            print(f"Errore nella creazione della directory dei log: {e}")
+            self._log_dir = Path.cwd()
+        
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        log_file = self._log_dir / f"{self._app_name}_{timestamp}.log"
+        self.baseFilename = os.path.abspath(log_file)
+        return super()._open()
+
 class Logger:
     """
     Logger centralizzato per il sistema ONEX.
@@ -21,27 +44,25 @@ class Logger:
                  app_name: str = "onex", console_output: bool = True):
         # Configura directory
         if log_dir is None:
-            base_dir = Path(__file__).parent.parent.parent.absolute()
+            base_dir = Path(__file__).resolve().parents[2]
             log_dir = base_dir / "logs"
         
         self.log_dir = log_dir
         self.app_name = app_name
         self.log_level = self._get_log_level(log_level)
         
-        # Crea directory dei log se non esiste
-        self._ensure_log_dir()
-        
         # Inizializza il logger
         self.logger = logging.getLogger(app_name)
         self.logger.setLevel(self.log_level)
-        self.logger.handlers = []  # Rimuovi handler esistenti
         
-        # Crea il file di log con timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        log_file = self.log_dir / f"{app_name}_{timestamp}.log"
+        # Logger già configurato (es. reload o test): mantieni gli handler
+        # esistenti invece di aprire un nuovo file di log
+        if self.logger.handlers:
+            return
         
-        # Handler per il file
-        file_handler = logging.FileHandler(log_file)
+        # Handler per il file: la directory e il file con timestamp
+        # vengono creati solo al primo messaggio registrato
+        file_handler = _LazyFileHandler(self.log_dir, app_name)
         file_handler.setLevel(self.log_level)
         
         # Handler per la console (se richiesto)
@@ -59,16 +80,9 @@ class Logger:
         # Aggiungi l'handler al logger
         self.logger.addHandler(file_handler)
         
-        # Log di avvio
-        self.info(f"Logger inizializzato. Livello: {log_level}")
-    
-    def _ensure_log_dir(self) -> None:
-        """Assicura che la directory dei log esista."""
-        try:
-            self.log_dir.mkdir(parents=True, exist_ok=True)
-        except Exception as e:
-            print(f"Errore nella creazione della directory dei log: {e}")
-            self.log_dir = Path.cwd()
+        # Log di avvio (a livello debug, per non creare il file di log
+        # nei processi che non registrano altro)
+        self.debug(f"Logger inizializzato. Livello: {log_level}")
     
     def _get_log_level(self, level_name: str) -> int:
         """Converte il nome del livello di log in costante logging."""
@@ -8,8 +8,34 @@ import os
 import sys
 import subprocess
 import shlex
+import functools
 from typing import Dict, List, Any, Tuple, Optional
 
+@functools.lru_cache(maxsize=128)
+def _read_shebang_interpreter(script_path: str, mtime_ns: int) -> Optional[str]:
+    """
+    Legge l'interprete dallo shebang di uno script.
+    Il risultato è memorizzato per (percorso, mtime): una modifica
+    dello script invalida automaticamente la voce in cache. L'esistenza
+    dell'interprete non fa parte della cache e va verificata a parte.
+    
+    Args:
+        script_path: Percorso allo script
+        mtime_ns: Data di modifica dello script in nanosecondi
+        
+    Returns:
+        Optional[str]: Il percorso all'interprete o None se manca lo shebang
+    """
+    try:
+        with open(script_path, 'r') as f:
+            first_line = f.readline().strip()
+            if first_line.startswith('#!'):
+                return first_line[2:].split()[0]
+    except:
+        pass
+    
+    return None
+
 class ShellManager:
     """
     Gestisce l'interazione con le shell di sistema,
@@ -18,7 +44,6 @@ class ShellManager:
     def __init__(self, system_info: Dict):
         self.system_info = system_info
         self.shell_type = self._detect_shell()
-        self.env = os.environ.copy()
     
     def _detect_shell(self) -> str:
         """
@@ -41,12 +66,14 @@ class ShellManager:
         else:
             return 'unknown'
     
-    def execute_command(self, command: str) -> Tuple[str, str, int]:
+    def execute_command(self, command: str, capture: bool = True) -> Tuple[str, str, int]:
         """
         Esegue un comando nella shell di sistema.
         
         Args:
             command: Il comando da eseguire
+            capture: Se True cattura e restituisce l'output, altrimenti
+                il comando scrive direttamente sul terminale
             
         Returns:
             Tuple[str, str, int]: Output standard, output errore e codice di ritorno
@@ -57,28 +84,43 @@ class ShellManager:
             if not args:
                 return "", "", 0
             
-            # Esecuzione del comando
-            proc = subprocess.Popen(
-                args,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                env=self.env
-            )
-            
-            # Cattura l'output
-            stdout, stderr = proc.communicate()
+            return self._run(args, capture)
             
-            # Stampa l'output
-            if stdout:
-                print(stdout, end='')
-            if stderr:
-                print(stderr, file=sys.stderr, end='')
+        except FileNotFoundError:
+            error_msg = f"Comando non trovato: {command.split()[0]}"
+            print(error_msg, file=sys.stderr)
+            return "", error_msg, 127
+        except Exception as e:
+            error_msg = f"Errore durante l'esecuzione del comando: {e}"
+            print(error_msg, file=sys.stderr)
+            return "", str(e), 1
+    
+    def execute_argv(self, args: List[str], capture: bool = True) -> Tuple[str, str, int]:
+        """
+        Esegue un comando già suddiviso in argomenti, senza un nuovo
+        parsing della riga. Se il programma non esiste il comando viene
+        passato alla shell, che può risolverlo come comando interno.
+        
+        Args:
+            args: Comando e argomenti da eseguire
+            capture: Se True cattura e restituisce l'output, altrimenti
+                il comando scrive direttamente sul terminale
             
-            return stdout, stderr, proc.returncode
+        Returns:
+            Tuple[str, str, int]: Output standard, output errore e codice di ritorno
+        """
+        if not args:
+            return "", "", 0
+        
+        try:
+            try:
+                return self._run(args, capture)
+            except FileNotFoundError:
+                shell = os.environ.get('SHELL') or '/bin/sh'
+                return self._run([shell, '-c', shlex.join(args)], capture)
             
         except FileNotFoundError:
-            error_msg = f"Comando non trovato: {command.split()[0]}"
+            error_msg = f"Comando non trovato: {args[0]}"
             print(error_msg, file=sys.stderr)
             return "", error_msg, 127
         except Exception as e:
@@ -86,13 +128,16 @@ class ShellManager:
             print(error_msg, file=sys.stderr)
             return "", str(e), 1
     
-    def execute_script(self, script_path: str, args: List[str] = None) -> Tuple[str, str, int]:
+    def execute_script(self, script_path: str, args: List[str] = None,
+                       capture: bool = True) -> Tuple[str, str, int]:
         """
         Esegue uno script shell.
         
         Args:
             script_path: Percorso allo script da eseguire
             args: Argomenti da passare allo script
+            capture: Se True cattura e restituisce l'output, altrimenti
+                lo script scrive direttamente sul terminale
             
         Returns:
             Tuple[str, str, int]: Output standard, output errore e codice di ritorno
@@ -112,28 +157,34 @@ class ShellManager:
         # Esegui lo script
         try:
             cmd = [interpreter, script_path] + args
-            proc = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                env=self.env
-            )
-            
-            stdout, stderr = proc.communicate()
-            
-            if stdout:
-                print(stdout, end='')
-            if stderr:
-                print(stderr, file=sys.stderr, end='')
-                
-            return stdout, stderr, proc.returncode
+            return self._run(cmd, capture)
             
         except Exception as e:
             error_msg = f"Errore durante l'esecuzione dello script: {e}"
             print(error_msg, file=sys.stderr)
             return "", str(e), 1
     
+    def _run(self, args: List[str], capture: bool) -> Tuple[str, str, int]:
+        """
+        Avvia un processo e ne attende la terminazione.
+        
+        Args:
+            args: Comando e argomenti da eseguire
+            capture: Se True l'output viene catturato in memoria; altrimenti
+                il processo eredita stdout/stderr e scrive sul terminale
+                senza passare per Python
+            
+        Returns:
+            Tuple[str, str, int]: Output standard, output errore e codice di ritorno
+        """
+        # Senza env esplicito il processo eredita os.environ
+        if capture:
+            proc = subprocess.run(args, capture_output=True, text=True)
+        else:
+            proc = subprocess.run(args)
+        
+        return proc.stdout or "", proc.stderr or "", proc.returncode
+    
     def _get_script_interpreter(self, script_path: str) -> str:
         """
         Determina l'interprete appropriato per uno script.
@@ -145,16 +196,17 @@ class ShellManager:
         Returns:
             str: Il percorso all'interprete da usare
         """
+        # Controlla se c'è uno shebang (una sola stat se già in cache)
         try:
-            # Controlla se c'è uno shebang
-            with open(script_path, 'r') as f:
-                first_line = f.readline().strip()
-                if first_line.startswith('#!'):
-                    interpreter = first_line[2:].split()[0]
-                    if os.path.exists(interpreter):
-                        return interpreter
-        except:
+            mtime_ns = os.stat(script_path).st_mtime_ns
+        except OSError:
             pass
+        else:
+            # L'interprete può essere installato dopo la prima lettura:
+            # la sua esistenza viene controllata a ogni chiamata
+            interpreter = _read_shebang_interpreter(script_path, mtime_ns)
+            if interpreter and os.path.exists(interpreter):
+                return interpreter
         
         # Usa l'estensione del file
         if script_path.endswith('.sh'):
@@ -179,7 +231,6 @@ class ShellManager:
             name: Nome della variabile
             value: Valore da assegnare
         """
-        self.env[name] = value
         os.environ[name] = value
     
     def get_environment_variable(self, name: str) -> Optional[str]:
@@ -192,4 +243,4 @@ class ShellManager:
         Returns:
             Optional[str]: Valore della variabile o None se non esiste
         """
-        return self.env.get(name)
+        return os.environ.get(name)
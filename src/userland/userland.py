@@ -7,9 +7,13 @@ Fornisce un ambiente a riga di comando con file system virtualizzato
 import os
 import sys
 import json
+import shlex
 import shutil
+import stat
+import posixpath
+import functools
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Callable
 
 # Aggiungi il percorso base al PATH
 base_path = Path(__file__).parent.parent.parent.absolute()
@@ -22,6 +26,92 @@ try:
 except ImportError:
     ONEX_MINI_LOGO = "ONEX>"
 
+# readline non è disponibile su tutte le piattaforme: senza di esso la
+# shell usa input() senza storico né completamento
+try:
+    import readline
+except ImportError:
+    readline = None
+
+# Numero massimo di comandi conservati nel file di storico
+HISTORY_LENGTH = 1000
+
+# Testo dell'aiuto per i comandi interni, formattato una sola volta
+_COMMANDS_HELP = "\nComandi disponibili:\n" + "".join(
+    f"  {cmd:<15} - {desc}\n" for cmd, desc in (
+        ("help", "Mostra questo messaggio di aiuto"),
+        ("exit", "Esci dall'ambiente userland"),
+        ("cd [dir]", "Cambia directory"),
+        ("ls [dir]", "Elenca i file nella directory"),
+        ("cat [file]", "Visualizza il contenuto di un file"),
+        ("pwd", "Mostra la directory corrente"),
+        ("whoami", "Mostra l'utente corrente"),
+        ("clear", "Pulisce lo schermo"),
+        ("apps [--all]", "Elenca le applicazioni disponibili"),
+        ("run <app> [args]", "Esegue un'applicazione"),
+        ("mkdir <dir>", "Crea una directory"),
+        ("touch ", "Crea un file vuoto"),
+        ("rm <file/dir>", "Rimuove un file o directory"),
+        ("echo [testo]", "Visualizza un testo sullo schermo")
+    ))
+_HELP_FOOTER = "\nInoltre, puoi eseguire comandi di sistema con la sintassi standard.\n\n"
+
+@functools.lru_cache(maxsize=512)
+def _resolve_virtual_path(fs_root: str, virtual_path: str) -> str:
+    """
+    Converte un percorso virtuale nel percorso reale corrispondente.
+    La conversione dipende solo dalle due stringhe: i risultati vengono
+    quindi memorizzati per i percorsi usati più spesso.
+    
+    Args:
+        fs_root: Radice del filesystem simulato
+        virtual_path: Percorso virtuale da convertire
+        
+    Returns:
+        str: Percorso reale
+    """
+    # Normalizza il percorso
+    if not virtual_path:
+        virtual_path = "/"
+    
+    # Gestione speciale per /mnt/system che deve puntare al filesystem reale
+    if virtual_path.startswith("/mnt/system"):
+        # Rimuovi "/mnt/system" e ottieni il percorso relativo al root reale
+        rel_path = virtual_path[11:]  # Lunghezza di "/mnt/system"
+        if not rel_path:
+            return "/"  # Root del filesystem reale
+        return rel_path
+    
+    # Rimuovi eventuali '..' e '.': normpath è implementata in C e, con
+    # il percorso reso assoluto, scarta i '..' oltre la radice come prima
+    rel_path = posixpath.normpath("/" + virtual_path.lstrip("/")).lstrip("/")
+    
+    # Costruisci il percorso reale
+    if not rel_path:
+        return fs_root
+    
+    return os.path.join(fs_root, rel_path)
+
+@functools.lru_cache(maxsize=None)
+def _ansi_supported() -> bool:
+    """
+    Verifica, una sola volta, se il terminale interpreta le sequenze ANSI.
+    Sulla console di Windows la modalità VT viene abilitata da colorama.
+    """
+    if os.name != 'nt':
+        return True
+    
+    try:
+        import colorama
+    except ImportError:
+        return False
+    
+    # just_fix_windows_console() esiste da colorama 0.4.6; nelle versioni
+    # precedenti init() converte le sequenze per la console
+    enable = getattr(colorama, "just_fix_windows_console", colorama.init)
+    enable()
+    return True
+
 class UserLandSystem:
     """
     Implementa l'ambiente utente virtualizzato con:
@@ -36,9 +126,18 @@ class UserLandSystem:
         self.user_info = user_info
         self.current_user = current_user
         self.fs_root = fs_root
-        self.current_dir = f"/home/{current_user}"
-        self.real_current_dir = fs_root / "home" / current_user
+        # I percorsi reali sono gestiti come stringhe: Path viene creato
+        # solo dove serve all'esterno (real_current_dir)
+        self._fs_root_str = str(fs_root)
+        self._set_current_dir(f"/home/{current_user}", fs_root / "home" / current_user)
+        self._history_path = str(self.real_current_dir / ".onex_history")
         self.app_manager = None
+        self._all_app_names = frozenset()
+        self._apps_help_cache: Optional[Tuple[int, str]] = None
+        self._running = False
+        
+        # Tabella dei comandi interni, costruita una sola volta
+        self._commands = self._build_commands()
         
         # Importa i moduli necessari
         try:
@@ -51,7 +150,7 @@ class UserLandSystem:
             self.input_handler = InputHandler()
             self.ui = UserInterface()
             self.app_manager = AppManager(base_path, fs_root)
-            self.app_manager.scan_apps()
+            self._scan_apps()
             
         except ImportError as e:
             print(f"❌ Errore durante l'importazione dei moduli richiesti: {e}")
@@ -60,7 +159,59 @@ class UserLandSystem:
     def start(self) -> None:
         """Avvia l'ambiente userland."""
         self._welcome()
-        self._main_loop()
+        self._setup_readline()
+        try:
+            self._main_loop()
+        finally:
+            self._save_history()
+    
+    def _setup_readline(self) -> None:
+        """Attiva il completamento dei comandi e carica lo storico."""
+        if readline is None:
+            return
+        
+        self._completions: List[str] = []
+        readline.set_completer(self._complete)
+        readline.set_completer_delims(" \t\n")
+        if "libedit" in (readline.__doc__ or ""):
+            # readline di macOS basato su libedit
+            readline.parse_and_bind("bind ^I rl_complete")
+        else:
+            readline.parse_and_bind("tab: complete")
+        
+        try:
+            readline.read_history_file(self._history_path)
+        except OSError:
+            pass
+        readline.set_history_length(HISTORY_LENGTH)
+    
+    def _save_history(self) -> None:
+        """Salva lo storico dei comandi nella home dell'utente."""
+        if readline is None:
+            return
+        
+        try:
+            readline.write_history_file(self._history_path)
+        except OSError:
+            pass
+    
+    def _complete(self, text: str, state: int) -> Optional[str]:
+        """
+        Funzione di completamento per readline: completa il primo
+        elemento della riga con i comandi interni e le applicazioni.
+        """
+        if state == 0:
+            if readline.get_line_buffer()[:readline.get_begidx()].strip():
+                # Argomento di un comando: nessun completamento
+                self._completions = []
+            else:
+                names = self._all_app_names.union(self._commands)
+                self._completions = sorted(
+                    name for name in names if name.startswith(text))
+        
+        if state < len(self._completions):
+            return self._completions[state]
+        return None
     
     def _welcome(self) -> None:
         """Mostra il messaggio di benvenuto."""
@@ -85,46 +236,76 @@ class UserLandSystem:
         print("Digita 'help' per la lista dei comandi disponibili")
         print("=================================================")
     
+    def _build_commands(self) -> Dict[str, Callable[[List[str]], None]]:
+        """
+        Costruisce la tabella dei comandi interni: a ogni nome è associata
+        una funzione che riceve la lista degli argomenti.
+        
+        Returns:
+            Dict[str, Callable[[List[str]], None]]: Comandi per nome
+        """
+        with_operand = self._with_operand
+        
+        return {
+            "exit": self._exit,
+            "help": lambda args: self._show_help(),
+            "cd": lambda args: self._change_directory(args[0] if args else ""),
+            "ls": lambda args: self._list_directory(args[0] if args else ""),
+            "cat": with_operand(self._cat_file, "cat: manca l'operando che specifica il file"),
+            "pwd": lambda args: print(self.current_dir),
+            "whoami": lambda args: print(self.current_user),
+            "clear": self._clear_screen,
+            "apps": self._list_apps,
+            "run": self._run_command,
+            "mkdir": with_operand(self._make_directory, "mkdir: manca l'operando"),
+            "touch": with_operand(self._touch_file, "touch: manca l'operando"),
+            "rm": with_operand(self._remove_file, "rm: manca l'operando"),
+            "echo": lambda args: print(" ".join(args)),
+        }
+    
+    @staticmethod
+    def _with_operand(handler: Callable[[str], None],
+                      error: str) -> Callable[[List[str]], None]:
+        """
+        Adatta un comando che richiede un operando alla firma della
+        tabella dei comandi.
+        
+        Args:
+            handler: Funzione da chiamare con il primo argomento
+            error: Messaggio da mostrare se manca l'operando
+        """
+        def command(args: List[str]) -> None:
+            if not args:
+                print(error)
+            else:
+                handler(args[0])
+        return command
+    
+    def _exit(self, args: List[str]) -> None:
+        """Termina il loop principale."""
+        self._running = False
+    
+    def _run_command(self, args: List[str]) -> None:
+        """Gestisce il comando run."""
+        if not args:
+            print("run: manca il nome dell'applicazione da eseguire")
+        else:
+            self._run_app(args[0], args[1:])
+    
     def _main_loop(self) -> None:
         """Loop principale dell'ambiente userland."""
-        running = True
-        while running:
+        self._running = True
+        while self._running:
             try:
                 # Mostra il prompt
-                prompt = f"{self.current_user}@onex:{self.current_dir}$ "
-                cmd = input(prompt).strip()
+                cmd = input(self._prompt).strip()
                 
                 if not cmd:
                     continue
                 
                 # Dividi il comando per gestire argomenti con spazi
-                cmd_parts = []
-                current_part = ""
-                in_quotes = False
-                quote_char = None
-                
-                for char in cmd:
-                    if char in ['"', "'"]:
-                        if not in_quotes:
-                            in_quotes = True
-                            quote_char = char
-                        elif char == quote_char:
-                            in_quotes = False
-                            quote_char = None
-                        else:
-                            current_part += char
-                    elif char.isspace() and not in_quotes:
-                        if current_part:
-                            cmd_parts.append(current_part)
-                            current_part = ""
-                    else:
-                        current_part += char
-                
-                if current_part:
-                    cmd_parts.append(current_part)
-                
-                # Controlla se è rimasta una citazione non chiusa
-                if in_quotes:
+                cmd_parts = self._split_command(cmd)
+                if cmd_parts is None:
                     print("Errore: citazione non chiusa nel comando")
                     continue
                 
@@ -134,61 +315,20 @@ class UserLandSystem:
                 
                 # Ottieni il comando base e gli argomenti
                 cmd_base = cmd_parts[0]
-                cmd_args = cmd_parts[1:] if len(cmd_parts) > 1 else []
+                cmd_args = cmd_parts[1:]
                 
-                # Elabora il comando
-                if cmd_base == "exit":
-                    running = False
-                elif cmd_base == "help":
-                    self._show_help()
-                elif cmd_base == "cd":
-                    path = cmd_args[0] if cmd_args else ""
-                    self._change_directory(path)
-                elif cmd_base == "ls":
-                    path = cmd_args[0] if cmd_args else ""
-                    self._list_directory(path)
-                elif cmd_base == "cat":
-                    if not cmd_args:
-                        print("cat: manca l'operando che specifica il file")
-                    else:
-                        self._cat_file(cmd_args[0])
-                elif cmd_base == "pwd":
-                    print(self.current_dir)
-                elif cmd_base == "whoami":
-                    print(self.current_user)
-                elif cmd_base == "clear":
-                    os.system('clear' if os.name != 'nt' else 'cls')
-                elif cmd_base == "apps":
-                    self._list_apps(cmd_args)
-                elif cmd_base == "run":
-                    if not cmd_args:
-                        print("run: manca il nome dell'applicazione da eseguire")
-                    else:
-                        self._run_app(cmd_args[0], cmd_args[1:])
-                elif cmd_base == "mkdir":
-                    if not cmd_args:
-                        print("mkdir: manca l'operando")
-                    else:
-                        self._make_directory(cmd_args[0])
-                elif cmd_base == "touch":
-                    if not cmd_args:
-                        print("touch: manca l'operando")
-                    else:
-                        self._touch_file(cmd_args[0])
-                elif cmd_base == "rm":
-                    if not cmd_args:
-                        print("rm: manca l'operando")
-                    else:
-                        self._remove_file(cmd_args[0])
-                elif cmd_base == "echo":
-                    print(" ".join(cmd_args))
+                # Elabora il comando: i comandi interni sono risolti
+                # con un'unica ricerca nella tabella
+                handler = self._commands.get(cmd_base)
+                if handler is not None:
+                    handler(cmd_args)
                 else:
                     # Prova ad eseguire come applicazione
-                    if self.app_manager and cmd_base in self.app_manager.apps or cmd_base in self.app_manager.system_apps:
+                    if self.app_manager is not None and cmd_base in self._all_app_names:
                         self._run_app(cmd_base, cmd_args)
                     else:
                         # Prova ad eseguire come comando di sistema
-                        result = self._execute_command(cmd)
+                        result = self._execute_command(cmd_parts)
                         if not result:
                             print(f"Comando non riconosciuto: {cmd_base}")
                     
@@ -197,39 +337,59 @@ class UserLandSystem:
             except Exception as e:
                 print(f"Errore: {e}")
     
+    def _clear_screen(self, args: List[str]) -> None:
+        """Pulisce lo schermo con le sequenze ANSI, senza avviare processi."""
+        if not _ansi_supported():
+            os.system('cls')
+            return
+        
+        sys.stdout.write("\x1b[2J\x1b[H")
+        sys.stdout.flush()
+    
+    @staticmethod
+    def _split_command(cmd: str) -> Optional[List[str]]:
+        """
+        Divide una riga di comando in argomenti secondo le regole POSIX.
+        
+        Args:
+            cmd: Riga di comando
+            
+        Returns:
+            Optional[List[str]]: Argomenti, o None se una citazione non è chiusa
+        """
+        # Senza virgolette né escape la divisione sugli spazi dà lo stesso
+        # risultato di shlex, che è un lexer in Python puro ed è più lento
+        if '"' not in cmd and "'" not in cmd and '\\' not in cmd:
+            return cmd.split()
+        
+        try:
+            return shlex.split(cmd, posix=True)
+        except ValueError:
+            return None
+    
     def _show_help(self) -> None:
         """Mostra l'elenco dei comandi disponibili."""
-        commands = [
-            ("help", "Mostra questo messaggio di aiuto"),
-            ("exit", "Esci dall'ambiente userland"),
-            ("cd [dir]", "Cambia directory"),
-            ("ls [dir]", "Elenca i file nella directory"),
-            ("cat [file]", "Visualizza il contenuto di un file"),
-            ("pwd", "Mostra la directory corrente"),
-            ("whoami", "Mostra l'utente corrente"),
-            ("clear", "Pulisce lo schermo"),
-            ("apps [--all]", "Elenca le applicazioni disponibili"),
-            ("run <app> [args]", "Esegue un'applicazione"),
-            ("mkdir <dir>", "Crea una directory"),
-            ("touch ", "Crea un file vuoto"),
-            ("rm <file/dir>", "Rimuove un file o directory"),
-            ("echo [testo]", "Visualizza un testo sullo schermo")
-        ]
-        
-        print("\nComandi disponibili:")
-        for cmd, desc in commands:
-            print(f"  {cmd:<15} - {desc}")
+        sys.stdout.write(f"{_COMMANDS_HELP}{self._apps_help()}{_HELP_FOOTER}")
+    
+    def _apps_help(self) -> str:
+        """
+        Restituisce la sezione dell'aiuto con le app di sistema, ricostruita
+        solo quando l'elenco delle app cambia.
+        """
+        if not self.app_manager:
+            return ""
         
-        # Mostra le app di sistema disponibili
-        if self.app_manager:
-            system_apps = self.app_manager.get_app_list(include_system=True)
-            if system_apps:
-                print("\nApplicazioni disponibili:")
-                for app in system_apps:
-                    if app.system_app:
-                        print(f"  {app.name:<15} - {app.description}")
+        revision = self.app_manager.revision
+        if self._apps_help_cache is None or self._apps_help_cache[0] != revision:
+            text = ""
+            apps = self.app_manager.get_app_list(include_system=True)
+            if apps:
+                text = "\nApplicazioni disponibili:\n" + "".join(
+                    f"  {app.name:<15} - {app.description}\n"
+                    for app in apps if app.system_app)
+            self._apps_help_cache = (revision, text)
         
-        print("\nInoltre, puoi eseguire comandi di sistema con la sintassi standard.\n")
+        return self._apps_help_cache[1]
     
     def _change_directory(self, path: str) -> None:
         """Cambia la directory corrente."""
@@ -245,26 +405,44 @@ class UserLandSystem:
                 new_path = "/"
         else:
             # Percorso relativo
-            if self.current_dir.endswith("/"):
-                new_path = f"{self.current_dir}{path}"
-            else:
-                new_path = f"{self.current_dir}/{path}"
+            new_path = self._current_dir_prefix + path
         
         # Converti in path reale nel filesystem
-        real_path = self._virtual_to_real_path(new_path)
+        real_path = self._real_path(new_path)
         
-        # Controlla se esiste e se è una directory
-        if not real_path.exists():
+        # Controlla se esiste e se è una directory, con un'unica stat
+        try:
+            mode = os.stat(real_path).st_mode
+        except OSError:
             print(f"cd: {path}: No such file or directory")
             return
         
-        if not real_path.is_dir():
+        if not stat.S_ISDIR(mode):
             print(f"cd: {path}: Not a directory")
             return
         
         # Aggiorna il percorso corrente
-        self.current_dir = new_path
+        self._set_current_dir(new_path, Path(real_path))
+    
+    def _set_current_dir(self, virtual_path: str, real_path: Path) -> None:
+        """
+        Imposta la directory corrente e aggiorna i valori che ne
+        dipendono: il prefisso dei percorsi relativi e il prompt.
+        """
+        self.current_dir = virtual_path
         self.real_current_dir = real_path
+        self._current_dir_prefix = (
+            virtual_path if virtual_path.endswith("/") else virtual_path + "/")
+        self._prompt = f"{self.current_user}@onex:{virtual_path}$ "
+    
+    def _resolve_arg(self, path: str) -> str:
+        """
+        Risolve un argomento di comando, assoluto o relativo alla
+        directory corrente, nel percorso reale corrispondente.
+        """
+        if path.startswith("/"):
+            return self._real_path(path)
+        return self._real_path(self._current_dir_prefix + path)
     
     def _list_directory(self, path: str) -> None:
         """Elenca i contenuti di una directory."""
@@ -273,115 +451,100 @@ class UserLandSystem:
             target_path = self.real_current_dir
         else:
             # Risolvi il percorso
-            if path.startswith("/"):
-                target_path = self._virtual_to_real_path(path)
-            else:
-                if self.current_dir.endswith("/"):
-                    virtual_path = f"{self.current_dir}{path}"
-                else:
-                    virtual_path = f"{self.current_dir}/{path}"
-                target_path = self._virtual_to_real_path(virtual_path)
+            target_path = self._resolve_arg(path)
         
-        # Controlla se esiste e se è una directory
-        if not target_path.exists():
+        # Controlla se esiste e se è una directory, con un'unica stat
+        try:
+            mode = os.stat(target_path).st_mode
+        except OSError:
             print(f"ls: cannot access '{path}': No such file or directory")
             return
         
-        if not target_path.is_dir():
+        if not stat.S_ISDIR(mode):
             print(f"{path}")
             return
         
-        # Elenca i file
+        # Elenca i file: scandir fornisce già il tipo di ogni voce, senza
+        # una stat e un controllo dei permessi separati per ciascuna
         try:
-            files = list(target_path.iterdir())
-            for file in sorted(files):
+            with os.scandir(target_path) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+            lines = []
+            for entry in entries:
                 # Mostra tipo e nome
-                if file.is_dir():
-                    print(f"\033[1;34m{file.name}/\033[0m")  # Blu per le directory
-                elif os.access(file, os.X_OK):
-                    print(f"\033[1;32m{file.name}*\\033[0m")  # Verde per gli eseguibili
+                if entry.is_dir():
+                    lines.append(f"\033[1;34m{entry.name}/\033[0m")  # Blu per le directory
+                elif self._is_executable(entry):
+                    lines.append(f"\033[1;32m{entry.name}*\033[0m")  # Verde per gli eseguibili
                 else:
-                    print(f"{file.name}")
+                    lines.append(entry.name)
         except PermissionError:
             print(f"ls: cannot open directory '{path}': Permission denied")
+            return
+        
+        # Un'unica scrittura per l'intero elenco
+        if lines:
+            lines.append("")
+            sys.stdout.write("\n".join(lines))
+    
+    @staticmethod
+    def _is_executable(entry: os.DirEntry) -> bool:
+        """Verifica se una voce di directory ha un permesso di esecuzione."""
+        try:
+            return bool(entry.stat().st_mode & 0o111)
+        except OSError:
+            # Link simbolico rotto
+            return False
     
     def _cat_file(self, path: str) -> None:
         """Visualizza il contenuto di un file."""
         # Risolvi il percorso del file
-        if path.startswith("/"):
-            real_path = self._virtual_to_real_path(path)
-        else:
-            if self.current_dir.endswith("/"):
-                virtual_path = f"{self.current_dir}{path}"
-            else:
-                virtual_path = f"{self.current_dir}/{path}"
-            real_path = self._virtual_to_real_path(virtual_path)
+        real_path = self._resolve_arg(path)
         
-        # Controlla se il file esiste
-        if not real_path.exists():
+        # Controlla se il file esiste e se è un file, con un'unica stat
+        try:
+            mode = os.stat(real_path).st_mode
+        except OSError:
             print(f"cat: {path}: No such file or directory")
             return
         
-        # Controlla se è un file
-        if not real_path.is_file():
+        if not stat.S_ISREG(mode):
             print(f"cat: {path}: Is a directory")
             return
         
-        # Leggi e mostra il contenuto
+        # Copia il contenuto a blocchi sullo stream binario dell'output,
+        # senza caricare l'intero file in memoria né decodificarlo
+        out = getattr(sys.stdout, "buffer", None)
         try:
-            with open(real_path, 'r') as f:
-                print(f.read())
+            if out is None:
+                # Output sostituito da uno stream solo testuale
+                with open(real_path, 'r') as f:
+                    print(f.read())
+                return
+            
+            sys.stdout.flush()
+            with open(real_path, 'rb') as f:
+                shutil.copyfileobj(f, out, 65536)
+            out.write(b"\n")
+            out.flush()
         except Exception as e:
             print(f"cat: {path}: {e}")
     
-    def _execute_command(self, cmd: str) -> bool:
-        """Esegue un comando di sistema."""
+    def _execute_command(self, cmd_parts: List[str]) -> bool:
+        """Esegue un comando di sistema con gli argomenti già suddivisi."""
         try:
-            result = self.shell_manager.execute_command(cmd)
+            result = self.shell_manager.execute_argv(cmd_parts, capture=False)
             return True
         except Exception as e:
             print(f"Errore durante l'esecuzione del comando: {e}")
             return False
     
-    def _virtual_to_real_path(self, virtual_path: str) -> Path:
+    def _real_path(self, virtual_path: str) -> str:
         """
         Converte un percorso virtuale nel filesystem simulato
         in un percorso reale nel filesystem effettivo.
         """
-        # Normalizza il percorso
-        if not virtual_path:
-            virtual_path = "/"
-        
-        # Gestione speciale per /mnt/system che deve puntare al filesystem reale
-        if virtual_path.startswith("/mnt/system"):
-            # Rimuovi "/mnt/system" e ottieni il percorso relativo al root reale
-            rel_path = virtual_path[11:]  # Lunghezza di "/mnt/system"
-            if not rel_path:
-                return Path("/")  # Root del filesystem reale
-            return Path(rel_path)
-        
-        # Rimuovi eventuali '..' e '.'
-        parts = []
-        for part in virtual_path.split("/"):
-            if part == "..":
-                if parts:
-                    parts.pop()
-            elif part and part != ".":
-                parts.append(part)
-        
-        # Ricostruisci il percorso virtuale normalizzato
-        if not parts:
-            norm_virtual_path = "/"
-        else:
-            norm_virtual_path = "/" + "/".join(parts)
-        
-        # Costruisci il percorso reale
-        if norm_virtual_path == "/":
-            return self.fs_root
-        
-        # Rimuovi la prima barra e unisci con la root del filesystem simulato
-        path_without_leading_slash = norm_virtual_path[1:]
-        return self.fs_root / path_without_leading_slash
+        return _resolve_virtual_path(self._fs_root_str, virtual_path)
     
     def _list_apps(self, args: List[str]) -> None:
         """Elenca le applicazioni disponibili."""
@@ -397,18 +560,35 @@ class UserLandSystem:
             print("Nessuna applicazione trovata")
             return
         
-        print("=== Applicazioni Disponibili ===\n")
-        
-        # Formatta l'output
-        name_width = max(len(app.name) for app in apps) + 2
-        version_width = max(len(app.version) for app in apps) + 2
-        
-        # Intestazione
-        print(f"{'Nome':<{name_width}}{'Versione':<{version_width}}Descrizione")
-        print("-" * (name_width + version_width + 40))
-        
+        # Calcola le larghezze delle colonne con un'unica scansione
+        name_width = version_width = 0
+        rows = []
         for app in apps:
-            print(f"{app.name:<{name_width}}{app.version:<{version_width}}{app.description}")
+            name, version = app.name, app.version
+            if len(name) > name_width:
+                name_width = len(name)
+            if len(version) > version_width:
+                version_width = len(version)
+            rows.append((name, version, app.description))
+        name_width += 2
+        version_width += 2
+        
+        # Intestazione e righe vengono scritte insieme
+        lines = [
+            "=== Applicazioni Disponibili ===\n",
+            f"{'Nome':<{name_width}}{'Versione':<{version_width}}Descrizione",
+            "-" * (name_width + version_width + 40),
+        ]
+        lines.extend(f"{name:<{name_width}}{version:<{version_width}}{description}"
+                     for name, version, description in rows)
+        lines.append("")
+        sys.stdout.write("\n".join(lines))
+    
+    def _scan_apps(self) -> None:
+        """Scansiona le applicazioni e aggiorna l'insieme dei nomi eseguibili."""
+        self.app_manager.scan_apps()
+        self._all_app_names = frozenset(self.app_manager.apps).union(
+            self.app_manager.system_apps)
     
     def _run_app(self, app_name: str, args: List[str] = None) -> None:
         """Esegue un'applicazione."""
@@ -423,53 +603,32 @@ class UserLandSystem:
     
     def _make_directory(self, path: str) -> None:
         """Crea una directory."""
-        if path.startswith("/"):
-            real_path = self._virtual_to_real_path(path)
-        else:
-            if self.current_dir.endswith("/"):
-                virtual_path = f"{self.current_dir}{path}"
-            else:
-                virtual_path = f"{self.current_dir}/{path}"
-            real_path = self._virtual_to_real_path(virtual_path)
+        real_path = self._resolve_arg(path)
         
         try:
-            real_path.mkdir(parents=True)
+            os.makedirs(real_path)
         except Exception as e:
             print(f"mkdir: impossibile creare la directory '{path}': {e}")
     
     def _touch_file(self, path: str) -> None:
         """Crea un file vuoto."""
-        if path.startswith("/"):
-            real_path = self._virtual_to_real_path(path)
-        else:
-            if self.current_dir.endswith("/"):
-                virtual_path = f"{self.current_dir}{path}"
-            else:
-                virtual_path = f"{self.current_dir}/{path}"
-            real_path = self._virtual_to_real_path(virtual_path)
+        real_path = self._resolve_arg(path)
         
         try:
-            real_path.parent.mkdir(parents=True, exist_ok=True)
-            real_path.touch()
+            os.makedirs(os.path.dirname(real_path), exist_ok=True)
+            Path(real_path).touch()
         except Exception as e:
             print(f"touch: impossibile creare il file '{path}': {e}")
     
     def _remove_file(self, path: str) -> None:
         """Rimuove un file o una directory."""
-        if path.startswith("/"):
-            real_path = self._virtual_to_real_path(path)
-        else:
-            if self.current_dir.endswith("/"):
-                virtual_path = f"{self.current_dir}{path}"
-            else:
-                virtual_path = f"{self.current_dir}/{path}"
-            real_path = self._virtual_to_real_path(virtual_path)
+        real_path = self._resolve_arg(path)
         
         try:
-            if real_path.is_dir():
+            if os.path.isdir(real_path):
                 shutil.rmtree(real_path)
             else:
-                real_path.unlink()
+                os.unlink(real_path)
         except Exception as e:
             print(f"rm: impossibile rimuovere '{path}': {e}")
 
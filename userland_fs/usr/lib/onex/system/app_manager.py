@@ -62,6 +62,9 @@ class AppManager:
         self.system_apps_dir = fs_root / "bin"
         self.apps: Dict[str, AppInfo] = {}
         self.system_apps: Dict[str, AppInfo] = {}
+        # Incrementato a ogni scansione: chi memorizza dati derivati
+        # dall'elenco delle app lo confronta per sapere se sono validi
+        self.revision = 0
         
     def scan_apps(self) -> None:
         """Scansiona e registra tutte le applicazioni disponibili."""
@@ -96,6 +99,7 @@ class AppManager:
                     )
                     self.system_apps[app_name] = app_info
         
+        self.revision += 1
         print(f"Caricate {len(self.apps)} applicazioni e {len(self.system_apps)} app di sistema")
     
     def _load_app_info(self, app_dir: Path) -> Optional[AppInfo]:
@@ -6,11 +6,20 @@ Implementazione del file manager interattivo basato su curses
 
 import os
 import sys
+import mmap
+import re
+import stat
 import shutil
+import operator
+import posixpath
 import subprocess
+import unicodedata
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from enum import Enum, auto
-from typing import List, Dict, Tuple, Optional, Any, Callable
+from enum import IntEnum
+from typing import List, Dict, Tuple, Optional, Any, Callable, Sequence
 
 # Importa curses in modo sicuro
 try:
@@ -32,79 +41,202 @@ except ImportError:
         print("Su Linux, assicurati che il pacchetto 'python3-curses' sia installato.")
         sys.exit(1)
 
-class FileType(Enum):
+# Larghezza dei caratteri nel terminale: usa wcwidth se disponibile
+try:
+    from wcwidth import wcwidth as _wcwidth
+except ImportError:
+    _wcwidth = None
+
+class FileType(IntEnum):
     """Enumerazione dei tipi di file."""
-    DIRECTORY = auto()
-    TEXT = auto()
-    BINARY = auto()
-    EXECUTABLE = auto()
-    IMAGE = auto()
-    AUDIO = auto()
-    VIDEO = auto()
-    ARCHIVE = auto()
-    LINK = auto()
-    OTHER = auto()
+    DIRECTORY = 0
+    TEXT = 1
+    BINARY = 2
+    EXECUTABLE = 3
+    IMAGE = 4
+    AUDIO = 5
+    VIDEO = 6
+    ARCHIVE = 7
+    LINK = 8
+    OTHER = 9
+
+# Estensioni riconosciute per ciascun tipo di file
+_SUFFIXES_BY_TYPE = {
+    FileType.TEXT: ('.txt', '.md', '.py', '.js', '.html', '.css', '.json', '.xml',
+                    '.sh', '.c', '.cpp', '.h', '.java', '.log', '.conf'),
+    FileType.IMAGE: ('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.svg', '.webp'),
+    FileType.AUDIO: ('.mp3', '.wav', '.ogg', '.flac', '.aac'),
+    FileType.VIDEO: ('.mp4', '.mkv', '.avi', '.mov', '.webm'),
+    FileType.ARCHIVE: ('.zip', '.tar', '.gz', '.bz2', '.xz', '.rar', '.7z'),
+    FileType.BINARY: ('.exe', '.dll', '.so', '.bin'),
+}
+
+# Tabella inversa estensione -> tipo, per una ricerca O(1) per file
+_SUFFIX_TO_TYPE: Dict[str, FileType] = {
+    suffix: file_type
+    for file_type, suffixes in _SUFFIXES_BY_TYPE.items()
+    for suffix in suffixes
+}
+
+# Prefisso e indice del colore mostrati nella lista per ciascun tipo
+_TYPE_DISPLAY: Dict[FileType, Tuple[str, int]] = {
+    FileType.DIRECTORY: ("📁 ", 1),  # Blu
+    FileType.TEXT: ("📄 ", 0),       # Bianco
+    FileType.IMAGE: ("🖼️  ", 3),     # Magenta
+    FileType.AUDIO: ("🎵 ", 4),      # Ciano
+    FileType.VIDEO: ("🎬 ", 4),      # Ciano
+    FileType.ARCHIVE: ("📦 ", 5),    # Giallo
+    FileType.LINK: ("🔗 ", 6),       # Viola chiaro
+}
+_EXECUTABLE_DISPLAY = ("🔧 ", 2)     # Verde
+_DEFAULT_DISPLAY = ("📄 ", 0)        # Bianco
+
+# Tabella completa (eseguibile, tipo) -> (prefisso, colore): ogni
+# FileItem ricava il proprio aspetto con un'unica ricerca
+_DISPLAY_TABLE: Dict[Tuple[bool, FileType], Tuple[str, int]] = {
+    (is_executable, file_type): (
+        _EXECUTABLE_DISPLAY if is_executable
+        else _TYPE_DISPLAY.get(file_type, _DEFAULT_DISPLAY)
+    )
+    for is_executable in (False, True)
+    for file_type in FileType
+}
+
+def _char_width(char: str) -> int:
+    """Restituisce il numero di celle del terminale occupate da un carattere."""
+    if _wcwidth is not None:
+        return max(0, _wcwidth(char))
+    
+    if unicodedata.combining(char):
+        return 0
+    return 2 if unicodedata.east_asian_width(char) in ('W', 'F') else 1
+
+def _cell_width(text: str) -> int:
+    """Restituisce il numero di celle del terminale occupate da un testo."""
+    return sum(map(_char_width, text))
+
+def _truncate_to_width(text: str, max_width: int) -> str:
+    """
+    Tronca un testo perché occupi al massimo max_width celle del terminale,
+    terminandolo con "...". Se il testo entra già viene restituito invariato.
+    
+    Args:
+        text: Testo da troncare
+        max_width: Numero massimo di celle disponibili
+        
+    Returns:
+        str: Il testo, eventualmente troncato
+    """
+    if _cell_width(text) <= max_width:
+        return text
+    
+    limit = max_width - 3
+    if limit <= 0:
+        return "..."[:max(0, max_width)]
+    
+    used = 0
+    for i, char in enumerate(text):
+        used += _char_width(char)
+        if used > limit:
+            return text[:i] + "..."
+    
+    return text
+
+# Punto di mount virtuale del filesystem reale
+_MNT_SYSTEM = "/mnt/system"
+_MNT_SYSTEM_LEN = len(_MNT_SYSTEM)
+
+def _virtual_parent(virtual_path: str) -> str:
+    """Restituisce la directory genitore di un percorso virtuale."""
+    return posixpath.dirname(virtual_path.rstrip("/")) or "/"
+
+# Byte letti all'inizio di un file per riconoscerlo come binario
+_BINARY_SNIFF_SIZE = 8192
+
+def _is_binary_file(path: Path) -> bool:
+    """
+    Riconosce un file binario dalla presenza di byte NUL nella parte
+    iniziale, senza leggerlo per intero.
+    """
+    with open(path, 'rb') as f:
+        return b'\x00' in f.read(_BINARY_SNIFF_SIZE)
 
 class FileItem:
     """Rappresenta un file nel file manager."""
-    def __init__(self, path: Path, virtual_path: str):
+    def __init__(self, path: Path, virtual_path: str,
+                 st: Optional[os.stat_result] = None,
+                 is_link: Optional[bool] = None):
         self.path = path
         self.virtual_path = virtual_path
         self.name = path.name
-        self.size = self._get_size()
+        
+        # Tipo, dimensione e permessi derivano da un unico stat_result,
+        # senza interrogare di nuovo il filesystem per ogni proprietà
+        if st is None:
+            st, is_link = self._stat(path)
+        elif is_link is None:
+            is_link = path.is_symlink()
+        
+        mode = st.st_mode
+        self.is_dir = stat.S_ISDIR(mode)
+        self.is_link = is_link
+        self.is_executable = stat.S_ISREG(mode) and bool(mode & 0o111)
+        self.size = 0 if self.is_dir else st.st_size
         self.type = self._get_type()
-        self.is_dir = path.is_dir()
-        self.is_executable = os.access(path, os.X_OK) if path.is_file() else False
+        self.prefix, self.color_pair = _DISPLAY_TABLE[(self.is_executable, self.type)]
+        
+        # Chiave di ordinamento: prima le directory, poi i file,
+        # in ordine alfabetico senza distinzione tra maiuscole e minuscole
+        self.sort_key = (0 if self.is_dir else 1, self.name.casefold())
     
-    def _get_size(self) -> int:
-        """Ottiene la dimensione del file."""
+    @classmethod
+    def from_dirent(cls, entry: os.DirEntry, virtual_path: str) -> "FileItem":
+        """
+        Crea un FileItem da una voce restituita da os.scandir.
+        
+        Args:
+            entry: Voce della directory
+            virtual_path: Percorso virtuale dell'elemento
+        """
+        is_link = entry.is_symlink()
         try:
-            if self.path.is_dir():
-                return 0  # Le directory non hanno una dimensione diretta
-            return self.path.stat().st_size
-        except:
-            return 0
+            st = entry.stat()
+        except OSError:
+            # Link simbolico rotto: usa le informazioni del link stesso
+            st = entry.stat(follow_symlinks=False)
+        return cls(Path(entry.path), virtual_path, st, is_link)
+    
+    @staticmethod
+    def _stat(path: Path) -> Tuple[os.stat_result, bool]:
+        """
+        Esegue lstat sul percorso e, solo per i link simbolici,
+        stat sulla destinazione.
+        
+        Returns:
+            Tuple[os.stat_result, bool]: Risultato della stat e flag di link simbolico
+        """
+        st = os.lstat(path)
+        if not stat.S_ISLNK(st.st_mode):
+            return st, False
+        
+        try:
+            return os.stat(path), True
+        except OSError:
+            return st, True
     
     def _get_type(self) -> FileType:
         """Determina il tipo di file basato sull'estensione o le proprietà."""
-        if self.path.is_dir():
+        if self.is_dir:
             return FileType.DIRECTORY
-        elif self.path.is_symlink():
+        elif self.is_link:
             return FileType.LINK
         
         # Controllo per eseguibili
-        if os.access(self.path, os.X_OK):
+        if self.is_executable:
             return FileType.EXECUTABLE
         
         # Controllo basato sull'estensione
-        suffix = self.path.suffix.lower()
-        
-        # File di testo
-        if suffix in ['.txt', '.md', '.py', '.js', '.html', '.css', '.json', '.xml', 
-                      '.sh', '.c', '.cpp', '.h', '.java', '.log', '.conf']:
-            return FileType.TEXT
-        
-        # Immagini
-        elif suffix in ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.svg', '.webp']:
-            return FileType.IMAGE
-            
-        # Audio
-        elif suffix in ['.mp3', '.wav', '.ogg', '.flac', '.aac']:
-            return FileType.AUDIO
-            
-        # Video
-        elif suffix in ['.mp4', '.mkv', '.avi', '.mov', '.webm']:
-            return FileType.VIDEO
-            
-        # Archivi
-        elif suffix in ['.zip', '.tar', '.gz', '.bz2', '.xz', '.rar', '.7z']:
-            return FileType.ARCHIVE
-            
-        # Binari
-        elif suffix in ['.exe', '.dll', '.so', '.bin']:
-            return FileType.BINARY
-            
-        return FileType.OTHER
+        return _SUFFIX_TO_TYPE.get(self.path.suffix.lower(), FileType.OTHER)
     
     def get_formatted_size(self) -> str:
         """Restituisce una dimensione formattata in maniera leggibile."""
@@ -123,22 +255,123 @@ class FileItem:
     
     def get_color(self) -> int:
         """Restituisce l'indice del colore da usare per questo file."""
-        if self.is_dir:
-            return 1  # Blu
-        elif self.is_executable:
-            return 2  # Verde
-        elif self.type == FileType.TEXT:
-            return 0  # Bianco
-        elif self.type == FileType.IMAGE:
-            return 3  # Magenta
-        elif self.type == FileType.AUDIO or self.type == FileType.VIDEO:
-            return 4  # Ciano
-        elif self.type == FileType.ARCHIVE:
-            return 5  # Giallo
-        elif self.type == FileType.LINK:
-            return 6  # Viola chiaro
+        return self.color_pair
+
+# Oltre questo numero di voci i FileItem vengono creati da più thread
+_PARALLEL_LOAD_THRESHOLD = 256
+_LOAD_WORKERS = 8
+
+# Numero di directory di cui tenere in memoria gli elementi già caricati
+_DIR_CACHE_SIZE = 16
+
+def _items_from_dirents(entries: List[os.DirEntry],
+                        virtual_paths: List[str]) -> List[FileItem]:
+    """Crea i FileItem delle voci indicate, saltando quelle non accessibili."""
+    items = []
+    for entry, virtual_path in zip(entries, virtual_paths):
+        try:
+            items.append(FileItem.from_dirent(entry, virtual_path))
+        except OSError:
+            # Ignora file a cui non abbiamo accesso
+            pass
+    return items
+
+# Terminatori di riga riconosciuti oltre a '\n': '\r\n' e '\r' isolato
+_CR_LINE_END = re.compile(rb'\r\n?|\n')
+
+class TextLines:
+    """
+    Righe di un file di testo lette su richiesta tramite mmap.
+    Viene indicizzato solo l'inizio di ogni riga: il testo viene
+    decodificato soltanto per le righe effettivamente mostrate.
+    """
+    def __init__(self, path: Path):
+        self._file = open(path, 'rb')
+        try:
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            # File vuoti o speciali (es. /proc) non sono mappabili
+            self._data = self._file.read()
+        self._starts = self._index_lines(self._data)
+        
+        # Fine dell'ultima riga, escluso l'eventuale a capo finale
+        # ('\r' residuo viene rimosso in _decode_lines)
+        self._end = len(self._data)
+        if self._data[-1:] == b'\n':
+            self._end -= 1
+    
+    @staticmethod
+    def _index_lines(data) -> array:
+        """
+        Restituisce le posizioni di inizio di ogni riga. Come
+        str.splitlines(), anche un '\r' isolato chiude una riga.
+        """
+        starts = array('q', [0] if data else [])
+        size = len(data)
+        
+        if data.find(b'\r') == -1:
+            # Caso comune: solo '\n', ricerca diretta senza regex
+            find = data.find
+            pos = find(b'\n')
+            while pos != -1:
+                pos += 1
+                if pos < size:
+                    starts.append(pos)
+                pos = find(b'\n', pos)
         else:
-            return 0  # Bianco
+            for match in _CR_LINE_END.finditer(data):
+                pos = match.end()
+                if pos < size:
+                    starts.append(pos)
+        
+        return starts
+    
+    def __len__(self) -> int:
+        return len(self._starts)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self._starts))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            return self._decode_lines(start, stop)
+        
+        if index < 0:
+            index += len(self._starts)
+        return self._decode_lines(index, index + 1)[0]
+    
+    def _decode_lines(self, start: int, stop: int) -> List[str]:
+        """
+        Decodifica le righe da start a stop (escluso) con un'unica
+        operazione sul blocco di byte che le contiene.
+        """
+        if start >= stop:
+            return []
+        
+        if stop < len(self._starts):
+            end = self._starts[stop] - 1
+        else:
+            end = self._end
+        
+        block = self._data[self._starts[start]:end]
+        if block.endswith(b'\r'):
+            block = block[:-1]
+        if b'\r' in block:
+            # Dopo '\r\n' restano solo '\r' isolati, anch'essi a capo
+            block = block.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+        return block.decode('utf-8', errors='replace').split('\n')
+    
+    def close(self) -> None:
+        """Rilascia la mappatura e chiude il file."""
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+    
+    def __enter__(self) -> "TextLines":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
 class FileManager:
     """
@@ -159,7 +392,23 @@ class FileManager:
         self.screen_width = 0
         self.list_height = 0
         
+        # Righe della lista già disegnate (testo, attributo): permettono
+        # di riscrivere solo le righe cambiate tra un frame e l'altro
+        self._last_drawn: List[Optional[Tuple[str, int]]] = []
+        self._names_width: Optional[int] = None
+        self._rows_fit = True
+        self._header_drawn: Optional[Tuple[str, int]] = None
+        self._needs_full_redraw = True
+        
         self.stdscr = None
+        self._header_win = None
+        self._list_win = None
+        self._footer_win = None
+        self._popup_win = None
+        
+        # Elementi delle directory visitate di recente, validi finché
+        # data di modifica e inode della directory non cambiano
+        self._dir_cache: "OrderedDict[str, Tuple[Tuple[int, int], List[FileItem]]]" = OrderedDict()
         self._is_running = False
     
     def start(self) -> None:
@@ -209,117 +458,305 @@ class FileManager:
         curses.init_pair(8, curses.COLOR_WHITE, curses.COLOR_BLUE)   # Header
         curses.init_pair(9, curses.COLOR_BLACK, curses.COLOR_WHITE)  # Footer
         
+        # Leggi le dimensioni dello schermo: il caricamento iniziale
+        # potrebbe già dover mostrare un messaggio di errore
+        self._update_screen_size()
+        
         # Carica la directory iniziale
         self._load_directory()
         
-        # Loop principale
+        # Loop principale: le dimensioni dello schermo vengono lette solo
+        # al primo frame e dopo un ridimensionamento, non a ogni tasto
         while self._is_running:
-            self.screen_height, self.screen_width = self.stdscr.getmaxyx()
-            self.list_height = self.screen_height - self.header_lines - self.footer_lines
-            
             self._draw_interface()
             self._handle_input()
     
-    def _load_directory(self) -> None:
-        """Carica i file nella directory corrente."""
+    def _update_screen_size(self) -> None:
+        """
+        Legge le dimensioni del terminale e, se sono cambiate, ricalcola
+        l'altezza della lista e adatta le finestre.
+        """
+        height, width = self.stdscr.getmaxyx()
+        if (height, width) == (self.screen_height, self.screen_width):
+            return
+        
+        self.screen_height, self.screen_width = height, width
+        self.list_height = max(1, height - self.header_lines - self.footer_lines)
+        self._layout_windows()
+    
+    def _layout_windows(self) -> None:
+        """
+        Crea le finestre di header, lista e footer, oppure le adatta
+        alle nuove dimensioni dello schermo.
+        """
+        width = self.screen_width
+        footer_y = self.header_lines + self.list_height
+        
+        self._header_win = self._place_window(self._header_win, self.header_lines, width, 0)
+        self._list_win = self._place_window(self._list_win, self.list_height, width, self.header_lines)
+        self._footer_win = self._place_window(self._footer_win, self.footer_lines, width, footer_y)
+    
+    @staticmethod
+    def _place_window(win, height: int, width: int, y: int):
+        """Crea una finestra o la ridimensiona e la sposta alla riga indicata."""
+        if win is None:
+            return curses.newwin(height, width, y, 0)
+        
+        win.resize(height, width)
+        win.mvwin(y, 0)
+        return win
+    
+    @staticmethod
+    def _addstr_safe(win, y: int, x: int, text: str, attr: int = 0) -> None:
+        """
+        Scrive una stringa tollerando l'errore restituito da curses
+        quando la scrittura raggiunge l'ultima cella della finestra.
+        """
+        try:
+            win.addstr(y, x, text, attr)
+        except curses.error:
+            pass
+    
+    def _invalidate_screen(self) -> None:
+        """
+        Forza il ridisegno completo dell'interfaccia al prossimo frame,
+        rileggendo anche le dimensioni dello schermo.
+        """
+        self._needs_full_redraw = True
+    
+    def _load_directory(self, use_cache: bool = True) -> None:
+        """
+        Carica i file nella directory corrente.
+        
+        Args:
+            use_cache: Se True riusa gli elementi già caricati per la
+                directory, se la sua data di modifica e il suo inode
+                non sono cambiati
+        """
         self.items = []
         self.selection = 0
         self.offset = 0
+        self._last_drawn = []
+        self._names_width = None
+        
+        virtual_dir = self.current_virtual_dir
+        dir_state = self._dir_state(self.current_real_dir)
+        if use_cache and dir_state is not None:
+            cached = self._dir_cache.get(virtual_dir)
+            if cached is not None and cached[0] == dir_state:
+                self._dir_cache.move_to_end(virtual_dir)
+                self.items = cached[1]
+                return
         
         try:
             # Verifica se stiamo accedendo al filesystem reale
-            is_real_fs = self.current_virtual_dir.startswith("/mnt/system")
+            is_real_fs = self.current_virtual_dir.startswith(_MNT_SYSTEM)
             
             # Aggiungi '..' per tornare alla directory superiore
             if self.current_virtual_dir != "/":
                 parent_path = self.current_real_dir.parent
-                parent_virtual = str(Path(self.current_virtual_dir).parent)
+                parent_virtual = _virtual_parent(self.current_virtual_dir)
                 self.items.append(FileItem(parent_path, parent_virtual))
                 self.items[0].name = ".."  # Override del nome per chiarezza
+                self.items[0].sort_key = (-1, "")  # Sempre in cima alla lista
+            
+            entries = []
+            scanned = False
             
             # Gestione speciale per i permessi quando si accede al filesystem reale
             if is_real_fs:
+                # Il percorso virtuale è quello reale sotto /mnt/system
+                prefix = posixpath.join(_MNT_SYSTEM, str(self.current_real_dir).lstrip("/"))
                 try:
                     # Carica tutti i file e le directory con controllo permessi
-                    for item in self.current_real_dir.iterdir():
-                        try:
-                            # Converti il percorso reale in percorso virtuale
-                            rel_path = str(item.relative_to('/') if str(item).startswith('/') else item)
-                            virtual_path = os.path.join("/mnt/system", rel_path)
-                            virtual_path = virtual_path.replace("\\", "/")  # Normalizza separatori
-                            self.items.append(FileItem(item, virtual_path))
-                        except (PermissionError, OSError):
-                            # Ignora file a cui non abbiamo accesso
-                            pass
+                    with os.scandir(self.current_real_dir) as it:
+                        entries = list(it)
+                    scanned = True
                 except (PermissionError, OSError) as e:
                     # Mostra errore se non possiamo accedere alla directory
                     self._show_error(f"Accesso negato a {self.current_real_dir}: {e}")
                     # Torna alla directory precedente se possibile
-                    if self.current_virtual_dir != "/mnt/system":
+                    if self.current_virtual_dir != _MNT_SYSTEM:
                         self._action_go_parent()
             else:
                 # Normali operazioni per il filesystem virtuale
-                for item in self.current_real_dir.iterdir():
-                    try:
-                        virtual_path = os.path.join(self.current_virtual_dir, item.name)
-                        virtual_path = virtual_path.replace("\\", "/")  # Normalizza separatori
-                        self.items.append(FileItem(item, virtual_path))
-                    except PermissionError:
-                        # Salta i file a cui non abbiamo accesso
-                        pass
+                prefix = self.current_virtual_dir
+                with os.scandir(self.current_real_dir) as it:
+                    entries = list(it)
+                scanned = True
+            
+            # Il prefisso viene calcolato una sola volta: ogni percorso
+            # virtuale è una semplice concatenazione
+            if not prefix.endswith("/"):
+                prefix += "/"
+            virtual_paths = [prefix + entry.name for entry in entries]
+            
+            self.items.extend(self._create_items(entries, virtual_paths))
             
             # Ordina: prima le directory, poi i file, in ordine alfabetico
-            self.items.sort(key=lambda x: (0 if x.name == ".." else 
-                                         (1 if not x.is_dir else 0), x.name.lower()))
+            self.items.sort(key=operator.attrgetter('sort_key'))
+            
+            self._prepare_display()
+            
+            if scanned and dir_state is not None:
+                self._dir_cache[virtual_dir] = (dir_state, self.items)
+                self._dir_cache.move_to_end(virtual_dir)
+                if len(self._dir_cache) > _DIR_CACHE_SIZE:
+                    self._dir_cache.popitem(last=False)
         except Exception as e:
             self._show_error(f"Errore nel caricamento della directory: {e}")
     
+    @staticmethod
+    def _dir_state(path: Path) -> Optional[Tuple[int, int]]:
+        """
+        Restituisce data di modifica (in ns) e inode di una directory,
+        o None se non è accessibile.
+        """
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_ino)
+    
+    @staticmethod
+    def _create_items(entries: List[os.DirEntry],
+                      virtual_paths: List[str]) -> List[FileItem]:
+        """
+        Crea i FileItem delle voci di una directory. Nelle directory grandi
+        le voci vengono divise in blocchi, uno per thread: le stat
+        rilasciano il GIL e possono quindi procedere in parallelo.
+        """
+        count = len(entries)
+        if count <= _PARALLEL_LOAD_THRESHOLD:
+            return _items_from_dirents(entries, virtual_paths)
+        
+        # Un blocco per thread: un task per voce costerebbe più della stat
+        chunk = -(-count // _LOAD_WORKERS)
+        with ThreadPoolExecutor(max_workers=_LOAD_WORKERS) as executor:
+            futures = [
+                executor.submit(_items_from_dirents,
+                                entries[i:i + chunk], virtual_paths[i:i + chunk])
+                for i in range(0, count, chunk)
+            ]
+            return [item for future in futures for item in future.result()]
+    
+    def _prepare_display(self) -> None:
+        """
+        Precalcola per ogni elemento dimensione formattata e attributo di
+        colore, così il disegno della lista non deve ricalcolarli a ogni
+        frame.
+        """
+        for item in self.items:
+            item.display_size = item.get_formatted_size().rjust(10)
+            item.color_attr = curses.color_pair(item.color_pair)
+    
+    def _prepare_names(self) -> None:
+        """
+        Calcola il nome da visualizzare di ogni elemento, troncato in base
+        alle celle del terminale disponibili alla larghezza corrente.
+        Viene ripetuto solo dopo un caricamento o un ridimensionamento.
+        """
+        width = self.screen_width
+        rows_fit = width > len(" Directory vuota")
+        for item in self.items:
+            max_width = width - _cell_width(item.prefix) - len(item.display_size) - 3
+            item.display_name = _truncate_to_width(item.name, max_width)
+            if max_width < 0:
+                rows_fit = False
+        
+        # Su schermi molto stretti prefisso e dimensione non entrano:
+        # le righe vanno allora scritte e troncate una alla volta
+        self._rows_fit = rows_fit
+        self._names_width = width
+    
     def _draw_interface(self) -> None:
-        """Disegna l'interfaccia del file manager."""
-        self.stdscr.clear()
+        """
+        Disegna l'interfaccia del file manager.
+        Header, lista e footer sono finestre separate: ognuna accoda le
+        proprie modifiche con noutrefresh e il terminale viene aggiornato
+        con un unico doupdate.
+        """
+        if self._needs_full_redraw:
+            self._update_screen_size()
+            
+            # Svuota lo schermo e dimentica quanto già disegnato
+            self.stdscr.erase()
+            self.stdscr.noutrefresh()
+            for win in (self._header_win, self._list_win, self._footer_win):
+                win.erase()
+            self._last_drawn = []
+            self._header_drawn = None
+            self._needs_full_redraw = False
         
-        # Disegna l'header
+        self._draw_header()
+        self._draw_file_list()
+        self._draw_footer()
+        
+        self._header_win.noutrefresh()
+        self._list_win.noutrefresh()
+        self._footer_win.noutrefresh()
+        curses.doupdate()
+    
+    def _draw_header(self) -> None:
+        """Disegna l'header, solo se directory o larghezza sono cambiate."""
+        header_state = (self.current_virtual_dir, self.screen_width)
+        if self._header_drawn == header_state:
+            return
+        
+        win = self._header_win
+        width = self.screen_width
+        win.erase()
+        
+        # Titolo, su sfondo blu esteso a tutta la riga
         header = f" ONEX File Manager - {self.current_virtual_dir} "
-        self.stdscr.attron(curses.color_pair(8) | curses.A_BOLD)
-        self.stdscr.addstr(0, 0, " " * self.screen_width)  # Sfondo blu per tutta la riga
-        self.stdscr.addstr(0, (self.screen_width - len(header)) // 2, header[:self.screen_width])
-        self.stdscr.attroff(curses.color_pair(8) | curses.A_BOLD)
+        attr = curses.color_pair(8) | curses.A_BOLD
+        win.chgat(0, 0, -1, attr)
+        win.addnstr(0, max(0, (width - len(header)) // 2), header, width, attr)
         
-        # Disegna la guida dei tasti
+        # Guida dei tasti
         key_guide = " Enter: Apri | F1: Aiuto | F5: Aggiorna | F10/Q: Esci "
-        self.stdscr.addstr(1, 0, key_guide[:self.screen_width])
+        win.addnstr(1, 0, key_guide, width)
         
-        # Linea separatrice
-        self.stdscr.addstr(2, 0, "─" * self.screen_width)
+        # Linea separatrice: hline disegna il carattere di linea nativo
+        # senza costruire una stringa larga quanto lo schermo
+        win.hline(2, 0, curses.ACS_HLINE, width)
         
-        # Disegna la lista dei file
-        self._draw_file_list()
+        self._header_drawn = header_state
+    
+    def _draw_footer(self) -> None:
+        """Disegna il footer con le informazioni sull'elemento selezionato."""
+        win = self._footer_win
+        width = self.screen_width
+        
+        # Linea separatrice
+        win.hline(0, 0, curses.ACS_HLINE, width)
         
-        # Disegna il footer
-        footer_y = self.screen_height - self.footer_lines
-        self.stdscr.attron(curses.color_pair(9))
-        self.stdscr.addstr(footer_y, 0, " " * self.screen_width)
+        # Riga di stato: pulisci e colora l'intera riga, poi scrivi il testo
+        attr = curses.color_pair(9)
+        win.move(1, 0)
+        win.clrtoeol()
+        win.chgat(1, 0, -1, attr)
         
         if self.selection < len(self.items):
             item = self.items[self.selection]
             footer_text = f" {item.name} - {item.get_formatted_size()} "
-            self.stdscr.addstr(footer_y, 0, footer_text[:self.screen_width])
+            self._addstr_safe(win, 1, 0, footer_text[:width], attr)
         
         help_text = " F1=Aiuto Esc=Indietro "
-        if len(help_text) < self.screen_width:
-            self.stdscr.addstr(footer_y, self.screen_width - len(help_text), help_text)
-        self.stdscr.attroff(curses.color_pair(9))
-        
-        # Linea separatrice
-        self.stdscr.addstr(footer_y - 1, 0, "─" * self.screen_width)
-        
-        self.stdscr.refresh()
+        if len(help_text) < width:
+            self._addstr_safe(win, 1, width - len(help_text), help_text, attr)
     
     def _draw_file_list(self) -> None:
-        """Disegna la lista dei file."""
-        if not self.items:
-            self.stdscr.addstr(self.header_lines + 1, 0, " Directory vuota")
-            return
+        """
+        Disegna la lista dei file.
+        Vengono riscritte solo le righe il cui contenuto o attributo è
+        cambiato rispetto al frame precedente.
+        """
+        win = self._list_win
+        if len(self._last_drawn) != self.list_height:
+            self._last_drawn = [None] * self.list_height
+        if self._names_width != self.screen_width:
+            self._prepare_names()
         
         # Assicurati che la selezione sia visibile
         if self.selection < self.offset:
@@ -331,63 +768,87 @@ class FileManager:
         max_offset = max(0, len(self.items) - self.list_height)
         self.offset = min(self.offset, max_offset)
         
-        # Disegna gli elementi visibili
-        for i in range(self.list_height):
-            idx = i + self.offset
-            if idx >= len(self.items):
-                break
+        # Disegna le righe visibili: righe cambiate e consecutive con lo
+        # stesso attributo vengono scritte insieme con un'unica chiamata
+        group: List[str] = []
+        group_y = group_attr = 0
+        selected_y = None
+        
+        try:
+            for i in range(self.list_height):
+                idx = i + self.offset
                 
-            item = self.items[idx]
-            
-            # Determina lo stile
-            if idx == self.selection:
-                attr = curses.color_pair(7)  # Selezione
-            else:
-                attr = curses.color_pair(item.get_color())
-            
-            # Prepara la stringa da visualizzare
-            prefix = "📁 " if item.is_dir else "📄 "
-            if item.is_executable:
-                prefix = "🔧 "
-            elif item.type == FileType.IMAGE:
-                prefix = "🖼️  "
-            elif item.type == FileType.AUDIO:
-                prefix = "🎵 "
-            elif item.type == FileType.VIDEO:
-                prefix = "🎬 "
-            elif item.type == FileType.ARCHIVE:
-                prefix = "📦 "
-            elif item.type == FileType.LINK:
-                prefix = "🔗 "
-            
-            name = item.name
-            size = item.get_formatted_size().rjust(10)
+                if idx < len(self.items):
+                    row = self._format_row(self.items[idx], idx == self.selection)
+                elif not self.items and i == 1:
+                    row = (" Directory vuota", 0)
+                else:
+                    row = ("", 0)
+                
+                if self._last_drawn[i] == row:
+                    continue
+                self._last_drawn[i] = row
+                
+                text, attr = row
+                if group and (not self._rows_fit or attr != group_attr
+                              or group_y + len(group) != i):
+                    self._write_rows(win, group_y, group, group_attr)
+                    group = []
+                if not group:
+                    group_y, group_attr = i, attr
+                group.append(text)
+                
+                if idx == self.selection:
+                    selected_y = i
             
-            # Calcola la lunghezza massima per il nome
-            max_name_len = self.screen_width - len(prefix) - len(size) - 3
-            if len(name) > max_name_len:
-                name = name[:max_name_len-3] + "..."
+            if group:
+                self._write_rows(win, group_y, group, group_attr)
             
-            # Formatta la riga
-            text = f"{prefix}{name} {size}"
-            padding = " " * max(0, self.screen_width - len(text))
-            text += padding
+            if selected_y is not None:
+                # Estendi l'evidenziazione della selezione a tutta la riga
+                win.chgat(selected_y, 0, -1, curses.color_pair(7))
+        except curses.error:
+            # Finestra troppo piccola: ridisegna tutto al prossimo frame
+            self._last_drawn = []
+    
+    def _write_rows(self, win, y: int, texts: List[str], attr: int) -> None:
+        """
+        Scrive righe consecutive con lo stesso attributo in un'unica
+        chiamata: il carattere di a capo pulisce il resto di ogni riga
+        e porta all'inizio della successiva.
+        """
+        if len(texts) == 1:
+            win.addnstr(y, 0, texts[0], self.screen_width, attr)
+        else:
+            win.addstr(y, 0, "\n".join(texts), attr)
+        win.clrtoeol()
+    
+    def _format_row(self, item: FileItem, selected: bool) -> Tuple[str, int]:
+        """
+        Prepara il testo e l'attributo di una riga della lista.
+        
+        Args:
+            item: Elemento da visualizzare
+            selected: True se l'elemento è selezionato
             
-            # Disegna la riga
-            try:
-                y = i + self.header_lines
-                self.stdscr.addstr(y, 0, text[:self.screen_width], attr)
-            except:
-                break
+        Returns:
+            Tuple[str, int]: Testo della riga e attributo curses
+        """
+        # Determina lo stile (coppia 7 per la selezione)
+        attr = curses.color_pair(7) if selected else item.color_attr
+        
+        # La riga non viene riempita di spazi: il resto viene pulito con
+        # clrtoeol, così una riga non può sconfinare in quella successiva
+        return f"{item.prefix}{item.display_name} {item.display_size}", attr
     
     def _handle_input(self) -> None:
         """Gestisce l'input dell'utente."""
         key = self.stdscr.getch()
         
-        if key == curses.KEY_UP:
-            self._move_selection(-1)
-        elif key == curses.KEY_DOWN:
-            self._move_selection(1)
+        if key == curses.KEY_UP or key == curses.KEY_DOWN:
+            # Le frecce già in coda (es. tasto tenuto premuto) vengono
+            # accorpate in un unico spostamento e quindi in un solo frame
+            self._move_selection(self._read_motion(key))
         elif key == curses.KEY_PPAGE:  # Page Up
             self._move_selection(-self.list_height)
         elif key == curses.KEY_NPAGE:  # Page Down
@@ -401,11 +862,42 @@ class FileManager:
         elif key == curses.KEY_BACKSPACE or key == 8 or key == 127 or key == 27:  # Esc/Backspace
             self._action_go_parent()
         elif key == curses.KEY_F5:
-            self._load_directory()  # Ricarica la directory
+            self._load_directory(use_cache=False)  # Ricarica la directory
         elif key == ord('q') or key == ord('Q') or key == curses.KEY_F10:
             self._is_running = False  # Esci
         elif key == curses.KEY_F1:
             self._show_help()
+        elif key == curses.KEY_RESIZE:
+            self._invalidate_screen()
+    
+    def _read_motion(self, key: int) -> int:
+        """
+        Somma lo spostamento della freccia ricevuta e di quelle già in
+        coda, senza attendere nuovo input. Il primo tasto diverso da una
+        freccia viene rimesso in coda per il ciclo successivo.
+        
+        Args:
+            key: Primo tasto freccia letto
+            
+        Returns:
+            int: Spostamento complessivo della selezione
+        """
+        delta = 0
+        self.stdscr.nodelay(True)
+        try:
+            while key != -1:
+                if key == curses.KEY_UP:
+                    delta -= 1
+                elif key == curses.KEY_DOWN:
+                    delta += 1
+                else:
+                    curses.ungetch(key)
+                    break
+                key = self.stdscr.getch()
+        finally:
+            self.stdscr.nodelay(False)
+        
+        return delta
     
     def _move_selection(self, delta: int) -> None:
         """Muove la selezione di un numero di elementi."""
@@ -441,10 +933,7 @@ class FileManager:
         if self.current_virtual_dir == "/":
             return
         
-        parent_virtual = str(Path(self.current_virtual_dir).parent)
-        if not parent_virtual:
-            parent_virtual = "/"
-            
+        parent_virtual = _virtual_parent(self.current_virtual_dir)
         parent_real = self.current_real_dir.parent
         
         self.current_virtual_dir = parent_virtual
@@ -469,6 +958,7 @@ class FileManager:
         # Ripristina l'interfaccia curses
         self.stdscr.touchwin()
         self.stdscr.refresh()
+        self._invalidate_screen()
     
     def _view_file(self, item: FileItem) -> None:
         """Visualizza il contenuto di un file."""
@@ -486,18 +976,21 @@ class FileManager:
     def _view_text_file(self, item: FileItem) -> None:
         """Visualizza un file di testo."""
         try:
-            with open(item.path, 'r') as f:
-                content = f.read()
+            # Il tipo deriva solo dall'estensione: controlla il contenuto
+            # prima di indicizzare il file
+            if _is_binary_file(item.path):
+                self._show_message(f"Il file {item.name} non è un file di testo o usa una codifica non supportata.")
+                return
             
-            self._show_text_viewer(item.name, content)
-        except UnicodeDecodeError:
-            self._show_message(f"Il file {item.name} non è un file di testo o usa una codifica non supportata.")
+            # Il file non viene letto per intero: il visualizzatore
+            # decodifica solo le righe visibili
+            with TextLines(item.path) as lines:
+                self._show_text_viewer(item.name, lines)
         except Exception as e:
             self._show_message(f"Errore durante la lettura del file: {e}")
     
-    def _show_text_viewer(self, title: str, content: str) -> None:
+    def _show_text_viewer(self, title: str, lines: Sequence[str]) -> None:
         """Mostra un visualizzatore di testo."""
-        lines = content.splitlines()
         top_line = 0
         exit_viewer = False
         
@@ -505,30 +998,31 @@ class FileManager:
         height, width = self.stdscr.getmaxyx()
         
         while not exit_viewer:
-            self.stdscr.clear()
+            # erase e non clear: clear forzerebbe la riscrittura
+            # dell'intero terminale a ogni tasto
+            self.stdscr.erase()
             
             # Disegna l'header
             header = f" {title} "
-            self.stdscr.attron(curses.color_pair(8) | curses.A_BOLD)
-            self.stdscr.addstr(0, 0, " " * width)
-            self.stdscr.addstr(0, (width - len(header)) // 2, header[:width])
-            self.stdscr.attroff(curses.color_pair(8) | curses.A_BOLD)
+            header_attr = curses.color_pair(8) | curses.A_BOLD
+            self.stdscr.chgat(0, 0, -1, header_attr)
+            self.stdscr.addnstr(0, max(0, (width - len(header)) // 2), header, width, header_attr)
             
             # Disegna il contenuto
+            # Le righe visibili vengono estratte con un'unica slice e
+            # troncate da addnstr, senza copie intermedie per riga
             max_lines = height - 3  # Riserva righe per header e footer
-            for i in range(min(max_lines, len(lines) - top_line)):
-                line = lines[top_line + i]
+            for i, line in enumerate(lines[top_line:top_line + max_lines]):
                 try:
-                    self.stdscr.addstr(i + 1, 0, line[:width])
+                    self.stdscr.addnstr(i + 1, 0, line, width)
                 except:
                     pass
             
             # Disegna il footer
             footer = f" Linee: {len(lines)} - Premi Q per uscire "
-            self.stdscr.attron(curses.color_pair(9))
-            self.stdscr.addstr(height - 1, 0, " " * width)
-            self.stdscr.addstr(height - 1, 0, footer[:width])
-            self.stdscr.attroff(curses.color_pair(9))
+            footer_attr = curses.color_pair(9)
+            self.stdscr.chgat(height - 1, 0, -1, footer_attr)
+            self._addstr_safe(self.stdscr, height - 1, 0, footer[:width], footer_attr)
             
             # Aggiorna lo schermo
             self.stdscr.refresh()
@@ -550,33 +1044,63 @@ class FileManager:
                 top_line = 0
             elif key == curses.KEY_END:
                 top_line = max(0, len(lines) - max_lines)
+            elif key == curses.KEY_RESIZE:
+                height, width = self.stdscr.getmaxyx()
+        
+        self._invalidate_screen()
+    
+    def _popup_window(self, height: int, width: int, y: int, x: int):
+        """
+        Restituisce la finestra dei popup: viene creata alla prima richiesta
+        e poi ridimensionata e spostata, invece di allocarne una nuova.
+        """
+        win = self._popup_win
+        if win is not None:
+            try:
+                # Sposta prima la finestra in alto a sinistra: ridimensionarla
+                # nella posizione precedente potrebbe farla uscire dallo schermo
+                win.mvwin(0, 0)
+                win.resize(height, width)
+                win.mvwin(y, x)
+                win.erase()
+                return win
+            except curses.error:
+                # Non più adattabile (es. schermo rimpicciolito): ricreala
+                pass
+        
+        self._popup_win = curses.newwin(height, width, y, x)
+        return self._popup_win
     
     def _show_message(self, message: str) -> None:
         """Mostra un messaggio in una finestra popup."""
         lines = message.splitlines()
+        prompt = "Premi un tasto per continuare..."
         
-        # Calcola dimensioni della finestra
-        max_line_len = max(len(line) for line in lines)
-        height = len(lines) + 4
-        width = max(max_line_len + 4, 20)
+        # Calcola dimensioni della finestra, senza superare lo schermo
+        max_line_len = max(len(line) for line in lines + [prompt])
+        height = min(len(lines) + 4, self.screen_height)
+        width = min(max(max_line_len + 4, 20), self.screen_width)
+        text_width = width - 4
         
         # Posiziona la finestra al centro
         y = (self.screen_height - height) // 2
         x = (self.screen_width - width) // 2
         
-        # Crea la finestra
-        win = curses.newwin(height, width, y, x)
+        win = self._popup_window(height, width, y, x)
         win.box()
         
-        # Mostra il messaggio
-        for i, line in enumerate(lines):
-            win.addstr(i + 2, 2, line)
+        # Mostra il messaggio, troncato se il popup non lo contiene
+        for i, line in enumerate(lines[:height - 4]):
+            win.addnstr(i + 2, 2, line, text_width)
         
         # Visualizza istruzioni
-        win.addstr(height - 2, 2, "Premi un tasto per continuare...")
+        win.addnstr(height - 2, 2, prompt, text_width)
         
         win.refresh()
         win.getch()  # Attendi un tasto
+        
+        # Il popup ha coperto parte dell'interfaccia
+        self._invalidate_screen()
     
     def _show_help(self) -> None:
         """Mostra la schermata di aiuto."""
@@ -612,27 +1136,17 @@ class FileManager:
             virtual_path = "/"
         
         # Gestione speciale per /mnt/system che deve puntare al filesystem reale
-        if virtual_path.startswith("/mnt/system"):
-            # Rimuovi "/mnt/system" e ottieni il percorso relativo al root reale
-            rel_path = virtual_path[11:]  # Lunghezza di "/mnt/system"
-            if not rel_path:
-                return Path("/")  # Root del filesystem reale
-            return Path(rel_path)
-        
-        # Normalizza il percorso
-        parts = []
-        for part in virtual_path.split("/"):
-            if part == "..":
-                if parts:
-                    parts.pop()
-            elif part and part != ".":
-                parts.append(part)
-        
-        # Costruisci il percorso reale
-        if not parts:
+        if virtual_path.startswith(_MNT_SYSTEM):
+            # Rimuovi "/mnt/system": il resto è il percorso nel root reale
+            return Path(virtual_path[_MNT_SYSTEM_LEN:] or "/")
+        
+        # Normalizza il percorso partendo dalla radice, così ".." non può
+        # risalire oltre la radice del filesystem virtuale
+        normalized = posixpath.normpath("/" + virtual_path).lstrip("/")
+        if not normalized:
             return self.fs_root
         
-        return self.fs_root.joinpath(*parts)
+        return self.fs_root / normalized
 
 # Funzione per avviare il file manager direttamente
 def start_file_manager(fs_root: Path, start_dir: str = "/") -> None: